@@ -1,30 +1,111 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, ReturnDocument, UpdateOne
+import asyncio
+import orjson
 import os
 import logging
+from collections import defaultdict
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
 
 
+class ORJSONResponse(Response):
+    """Serialize responses with orjson, skipping jsonable_encoder entirely."""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        # OPT_UTC_Z serializes BSON-decoded datetimes without a Python-level
+        # conversion step
+        return orjson.dumps(content, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection — one module-level client shared by every request on
+# the loop, with an explicitly sized pool so it doesn't grow lazily under load
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=10,
+    maxIdleTimeMS=60000,
+    serverSelectionTimeoutMS=2000,
+)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
-app = FastAPI(title="Idea Board API", description="API for the Idea Board application")
+app = FastAPI(
+    title="Idea Board API",
+    description="API for the Idea Board application",
+    default_response_class=ORJSONResponse,
+)
+
+# Monotonic version of the ideas collection, bumped on every persisted write;
+# get_ideas derives its ETag from it so unchanged lists can be answered with a
+# 304. The per-boot nonce keeps a fresh process (or another replica) from
+# falsely matching a client's ETag minted against a different history.
+app.state.ideas_version = 0
+app.state.boot_id = uuid.uuid4().hex[:8]
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Upvote coalescing state: bursts accumulate here and a background task
+# flushes them to Mongo in a single bulk_write every UPVOTE_FLUSH_INTERVAL
+UPVOTE_FLUSH_INTERVAL = 0.02
+pending_upvotes = defaultdict(int)
+upvote_counts = {}  # last persisted upvote count per idea id
+_upvotes_pending = asyncio.Event()
+_upvote_flush_task = None
+
+
+async def _drain_pending_upvotes():
+    """Persist the currently pending increments as one unordered bulk_write"""
+    snapshot = dict(pending_upvotes)
+    pending_upvotes.clear()
+    if not snapshot:
+        return
+    try:
+        await db.ideas.bulk_write(
+            [UpdateOne({"_id": idea_id}, {"$inc": {"upvotes": count}})
+             for idea_id, count in snapshot.items()],
+            ordered=False
+        )
+    except BaseException as exc:
+        # These increments were already 202-acknowledged, so neither a
+        # transient write failure nor a CancelledError injected mid-write may
+        # drop them: re-queue first, then let cancellation propagate
+        for idea_id, count in snapshot.items():
+            pending_upvotes[idea_id] += count
+        _upvotes_pending.set()
+        if not isinstance(exc, Exception):
+            raise
+        logger.exception("Upvote flush failed; re-queuing %d increment(s)", len(snapshot))
+        return
+    for idea_id, count in snapshot.items():
+        upvote_counts[idea_id] = upvote_counts.get(idea_id, 0) + count
+    # The bulk_write is what actually changes Mongo, so the cache version
+    # moves here — bumping at enqueue time would let a GET that lands
+    # before the flush cache the pre-flush counts under the new version
+    app.state.ideas_version += 1
+
+
+async def flush_upvotes():
+    """Drain pending upvotes into Mongo, one bulk_write per debounce window"""
+    while True:
+        await _upvotes_pending.wait()
+        # Debounce: let a burst accumulate before writing
+        await asyncio.sleep(UPVOTE_FLUSH_INTERVAL)
+        _upvotes_pending.clear()
+        await _drain_pending_upvotes()
+
 
 # Define Models
 class StatusCheck(BaseModel):
@@ -36,98 +117,217 @@ class StatusCheckCreate(BaseModel):
     client_name: str
 
 class Idea(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Stored as Mongo's _id so docs don't carry a second identifier and the
+    # upvote lookup rides the built-in _id index
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id")
     text: str = Field(..., max_length=280)
     upvotes: int = Field(default=0)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+    class Config:
+        populate_by_name = True
+
 class IdeaCreate(BaseModel):
     text: str = Field(..., max_length=280, min_length=1)
 
+class IdeaBatch(BaseModel):
+    ideas: List[IdeaCreate] = Field(..., min_length=1, max_length=500)
+
 class IdeaResponse(BaseModel):
     id: str
     text: str
     upvotes: int
     created_at: datetime
 
-# Helper function to prepare data for MongoDB
-def prepare_for_mongo(data):
-    if isinstance(data.get('created_at'), datetime):
-        data['created_at'] = data['created_at'].isoformat()
-    return data
-
-def parse_from_mongo(item):
-    if isinstance(item.get('created_at'), str):
-        item['created_at'] = datetime.fromisoformat(item['created_at'])
-    return item
-
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "Idea Board API is running!"}
 
 # Existing status check endpoints
-@api_router.post("/status", response_model=StatusCheck)
+@api_router.post("/status")
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
-    return status_obj
+    status_data = status_obj.dict()
+    # insert_one mutates its argument (adds _id), so hand it a copy
+    _ = await db.status_checks.insert_one(dict(status_data))
+    return ORJSONResponse(status_data)
 
-@api_router.get("/status", response_model=List[StatusCheck])
+@api_router.get("/status")
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+    # DB output is trusted: hand the documents straight to orjson instead of
+    # re-running StatusCheck field validation on every row
+    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
+    return ORJSONResponse(status_checks)
 
 # New Idea Board endpoints
-@api_router.get("/ideas", response_model=List[IdeaResponse])
-async def get_ideas():
-    """Get all ideas sorted by upvotes (descending) then by creation time (newest first)"""
-    ideas = await db.ideas.find().sort([("upvotes", -1), ("created_at", -1)]).to_list(1000)
-    return [IdeaResponse(**parse_from_mongo(idea)) for idea in ideas]
+@api_router.get("/ideas")
+async def get_ideas(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    after_upvotes: Optional[int] = None,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+):
+    """Get a page of ideas sorted by upvotes (descending) then by creation time (newest first)
 
-@api_router.post("/ideas", response_model=IdeaResponse)
+    Keyset pagination: pass the upvotes, created_at and id of the last idea
+    on the previous page as after_upvotes/after_created_at/after_id to fetch
+    the next page.
+    """
+    # The page only changes when the collection does, so an ETag keyed on the
+    # write version (plus the page params) lets clients revalidate for free
+    etag = f'W/"{app.state.boot_id}:{app.state.ideas_version}:{limit}:{after_upvotes}:{after_created_at}:{after_id}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # The cursor cut must order by exactly the same key as the sort below —
+    # the full (upvotes, created_at, _id) triple — or ties would skip and
+    # duplicate rows across pages
+    query = {}
+    if after_upvotes is not None and after_created_at is not None and after_id is not None:
+        query = {"$or": [
+            {"upvotes": {"$lt": after_upvotes}},
+            {"upvotes": after_upvotes, "created_at": {"$lt": after_created_at}},
+            {"upvotes": after_upvotes, "created_at": after_created_at, "_id": {"$lt": after_id}},
+        ]}
+
+    # Projection trims BSON decode work to the fields the response carries;
+    # batch_size keeps the driver from accumulating the full result at once
+    cursor = (
+        db.ideas.find(query, {"text": 1, "upvotes": 1, "created_at": 1})
+        .sort([("upvotes", -1), ("created_at", -1), ("_id", -1)])
+        .hint([("upvotes", -1), ("created_at", -1), ("_id", -1)])
+        .batch_size(200)
+        .limit(limit)
+    )
+    # Return the Mongo documents directly; orjson serializes them without a
+    # jsonable_encoder pass or a response_model revalidation pass.
+    ideas = []
+    async for idea in cursor:
+        idea["id"] = idea.pop("_id")
+        ideas.append(idea)
+    return ORJSONResponse(ideas, headers={"ETag": etag})
+
+@api_router.post("/ideas")
 async def create_idea(idea_input: IdeaCreate):
     """Create a new idea"""
     idea_dict = idea_input.dict()
     idea_obj = Idea(**idea_dict)
-    idea_data = prepare_for_mongo(idea_obj.dict())
-    await db.ideas.insert_one(idea_data)
-    return IdeaResponse(**idea_obj.dict())
-
-@api_router.patch("/ideas/{idea_id}/upvote", response_model=IdeaResponse)
-async def upvote_idea(idea_id: str):
-    """Increment the upvote count for an idea"""
-    # Find and update the idea
-    result = await db.ideas.find_one_and_update(
-        {"id": idea_id},
-        {"$inc": {"upvotes": 1}},
-        return_document=True
+    # Let Mongo stamp created_at via $currentDate so the server is the single
+    # clock source; the upsert filter is a fresh UUID so this always inserts
+    doc = idea_obj.dict(by_alias=True, exclude={"created_at"})
+    created = await db.ideas.find_one_and_update(
+        {"_id": doc["_id"]},
+        {"$setOnInsert": doc, "$currentDate": {"created_at": True}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
-    
-    if not result:
-        raise HTTPException(status_code=404, detail="Idea not found")
-    
-    return IdeaResponse(**parse_from_mongo(result))
+    app.state.ideas_version += 1
+    created["id"] = created.pop("_id")
+    return ORJSONResponse(created)
+
+@api_router.post("/ideas:batch")
+async def create_ideas(batch: IdeaBatch):
+    """Create many ideas in a single insert_many round-trip"""
+    docs = [Idea(**idea.dict()).dict(by_alias=True) for idea in batch.ideas]
+    # ordered=False lets Mongo apply the writes in parallel and keep going
+    # past individual failures
+    await db.ideas.insert_many(docs, ordered=False)
+    app.state.ideas_version += 1
+    return ORJSONResponse({"ids": [doc["_id"] for doc in docs]})
+
+@api_router.patch("/ideas/{idea_id}/upvote")
+async def upvote_idea(idea_id: str, sync: bool = False):
+    """Increment the upvote count for an idea
+
+    By default the increment is coalesced with concurrent upvotes and flushed
+    by a background bulk_write; the response is a 202 with the projected
+    count. Pass ?sync=1 to write through immediately.
+    """
+    if sync:
+        # Write-through path for clients that need the persisted count
+        result = await db.ideas.find_one_and_update(
+            {"_id": idea_id},
+            {"$inc": {"upvotes": 1}},
+            projection={"text": 1, "upvotes": 1, "created_at": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if not result:
+            raise HTTPException(status_code=404, detail="Idea not found")
+
+        upvote_counts[idea_id] = result["upvotes"]
+        app.state.ideas_version += 1
+        result["id"] = result.pop("_id")
+        return ORJSONResponse(result)
+
+    if idea_id not in upvote_counts:
+        doc = await db.ideas.find_one({"_id": idea_id}, {"upvotes": 1})
+        if not doc:
+            raise HTTPException(status_code=404, detail="Idea not found")
+        upvote_counts.setdefault(idea_id, doc["upvotes"])
+
+    pending_upvotes[idea_id] += 1
+    _upvotes_pending.set()
+    projected = upvote_counts[idea_id] + pending_upvotes[idea_id]
+    return ORJSONResponse({"id": idea_id, "upvotes": projected}, status_code=202)
 
 # Include the router in the main app
 app.include_router(api_router)
 
+# Normalize origins once: stripped entries keep Starlette on the fast exact-
+# match path, and credentials are only enabled for an explicit origin list
+# (allow_origins=["*"] with credentials is silently ignored by Starlette)
+cors_origins = [o.strip() for o in os.environ.get('CORS_ORIGINS', '').split(',') if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_credentials=bool(cors_origins),
+    allow_origins=cors_origins or ["*"],
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def init_db():
+    # Configure logging at startup rather than import time, so importing the
+    # module (e.g. from tests) doesn't install handlers on the root logger.
+    # Log calls should use lazy %s formatting, not f-strings, so disabled
+    # levels skip the formatting work.
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # Warm up the connection pool so the first request doesn't pay
+    # connection-establishment latency
+    await client.admin.command("ping")
+    # One-time migration: earlier versions stored created_at as an ISO string
+    await db.ideas.update_many(
+        {"created_at": {"$type": "string"}},
+        [{"$set": {"created_at": {"$toDate": "$created_at"}}}]
+    )
+    # Covering index for the get_ideas sort (including the _id tie-break, so
+    # the hint resolves), so Mongo walks the index instead of doing an
+    # in-memory sort over the whole collection
+    await db.ideas.create_index([("upvotes", -1), ("created_at", -1), ("_id", -1)])
+    global _upvote_flush_task
+    _upvote_flush_task = asyncio.create_task(flush_upvotes())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    if _upvote_flush_task is not None:
+        # Wait the cancellation out so an in-flight bulk_write finishes (or
+        # re-queues its snapshot) before the final drain below runs
+        _upvote_flush_task.cancel()
+        try:
+            await _upvote_flush_task
+        except asyncio.CancelledError:
+            pass
+    # Final drain: increments the API already acknowledged must not die with
+    # the process
+    await _drain_pending_upvotes()
+    await client.close()
@@ -23,12 +23,30 @@ const IdeaBoard = () => {
   const characterLimit = 280;
   const remainingChars = characterLimit - newIdea.length;
 
-  // Fetch ideas from the API
+  // Fetch ideas from the API, walking the keyset-paginated endpoint until
+  // the whole board has been loaded (the API caps each page at 100 ideas)
   const fetchIdeas = async (showLoadingSpinner = false) => {
     try {
       if (showLoadingSpinner) setIsLoading(true);
-      const response = await axios.get(`${API}/ideas`);
-      setIdeas(response.data);
+      const pageSize = 100;
+      const allIdeas = [];
+      let cursor = {};
+      for (;;) {
+        const response = await axios.get(`${API}/ideas`, {
+          params: { limit: pageSize, ...cursor }
+        });
+        const page = response.data;
+        allIdeas.push(...page);
+        if (page.length < pageSize) break;
+        // Cursor for the next page: the sort key of the last idea seen
+        const last = page[page.length - 1];
+        cursor = {
+          after_upvotes: last.upvotes,
+          after_created_at: last.created_at,
+          after_id: last.id
+        };
+      }
+      setIdeas(allIdeas);
       setLastUpdate(new Date());
     } catch (error) {
       console.error('Error fetching ideas:', error);
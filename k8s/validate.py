@@ -7,85 +7,90 @@ Validates all Kubernetes manifests for correctness and best practices
 import yaml
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def validate_yaml_syntax(file_path):
-    """Validate YAML syntax"""
+try:
+    # libyaml parses in C, roughly an order of magnitude faster
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+def parse_yaml(file_path):
+    """Parse a YAML file once; returns (docs, error)"""
     try:
         with open(file_path, 'r') as f:
-            docs = list(yaml.safe_load_all(f))
-        return True, len(docs)
+            docs = list(yaml.load_all(f, Loader=_YamlLoader))
+        return docs, None
     except yaml.YAMLError as e:
-        return False, str(e)
+        return None, str(e)
 
-def validate_kubernetes_resources(file_path):
+def validate_kubernetes_resources(file_path, docs):
     """Validate Kubernetes resource structure"""
     issues = []
-    
+
+    for doc in docs:
+        if doc is None:
+            continue
+        if not isinstance(doc, dict):
+            issues.append(f"Error parsing {file_path}: document is not a mapping")
+            continue
+
+        # Check required fields
+        if 'apiVersion' not in doc:
+            issues.append(f"Missing apiVersion in {file_path}")
+        if 'kind' not in doc:
+            issues.append(f"Missing kind in {file_path}")
+        if 'metadata' not in doc:
+            issues.append(f"Missing metadata in {file_path}")
+        elif 'name' not in doc['metadata']:
+            issues.append(f"Missing metadata.name in {file_path}")
+
+        # Check namespace consistency
+        if 'namespace' in doc.get('metadata', {}):
+            if doc['metadata']['namespace'] != 'ideaboard':
+                issues.append(f"Inconsistent namespace in {file_path}: {doc['metadata']['namespace']}")
+
+    return issues
+
+def _validate_file(file_path):
+    """Parse and per-file validate one manifest; runs in a worker process"""
+    docs, error = parse_yaml(file_path)
+    if error is not None:
+        return file_path, None, error, []
     try:
-        with open(file_path, 'r') as f:
-            docs = list(yaml.safe_load_all(f))
-        
-        for doc in docs:
-            if doc is None:
-                continue
-                
-            # Check required fields
-            if 'apiVersion' not in doc:
-                issues.append(f"Missing apiVersion in {file_path}")
-            if 'kind' not in doc:
-                issues.append(f"Missing kind in {file_path}")
-            if 'metadata' not in doc:
-                issues.append(f"Missing metadata in {file_path}")
-            elif 'name' not in doc['metadata']:
-                issues.append(f"Missing metadata.name in {file_path}")
-            
-            # Check namespace consistency
-            if 'namespace' in doc.get('metadata', {}):
-                if doc['metadata']['namespace'] != 'ideaboard':
-                    issues.append(f"Inconsistent namespace in {file_path}: {doc['metadata']['namespace']}")
-    
+        return file_path, docs, None, validate_kubernetes_resources(file_path, docs)
     except Exception as e:
-        issues.append(f"Error parsing {file_path}: {str(e)}")
-    
-    return issues
+        # A malformed document must become an issue for this file, not a
+        # traceback that kills the whole executor.map run
+        return file_path, docs, None, [f"Error parsing {file_path}: {e}"]
 
-def validate_resource_references(k8s_dir):
+def validate_resource_references(parsed):
     """Validate cross-resource references"""
     issues = []
     services = set()
     deployments = set()
     configmaps = set()
     secrets = set()
-    
+
     # Collect all resources
-    for yaml_file in k8s_dir.glob('*.yaml'):
-        if yaml_file.name in ['README.md']:
-            continue
-            
-        try:
-            with open(yaml_file, 'r') as f:
-                docs = list(yaml.safe_load_all(f))
-            
-            for doc in docs:
-                if doc is None:
-                    continue
-                
-                kind = doc.get('kind', '')
-                name = doc.get('metadata', {}).get('name', '')
-                
-                if kind == 'Service':
-                    services.add(name)
-                elif kind == 'Deployment':
-                    deployments.add(name)
-                elif kind == 'ConfigMap':
-                    configmaps.add(name)
-                elif kind == 'Secret':
-                    secrets.add(name)
-        
-        except Exception as e:
-            issues.append(f"Error processing {yaml_file}: {str(e)}")
-    
+    for docs in parsed.values():
+        for doc in docs:
+            if not isinstance(doc, dict):
+                continue
+
+            kind = doc.get('kind', '')
+            name = doc.get('metadata', {}).get('name', '')
+
+            if kind == 'Service':
+                services.add(name)
+            elif kind == 'Deployment':
+                deployments.add(name)
+            elif kind == 'ConfigMap':
+                configmaps.add(name)
+            elif kind == 'Secret':
+                secrets.add(name)
+
     # Validate references
     expected_services = {'mongodb-service', 'backend-service', 'frontend-service'}
     expected_deployments = {'mongodb-deployment', 'backend-deployment', 'frontend-deployment'}
@@ -105,53 +110,43 @@ def validate_resource_references(k8s_dir):
     
     return issues
 
-def validate_resource_limits():
+def validate_resource_limits(docs):
     """Validate resource limits and requests"""
     issues = []
-    
-    deployment_file = Path('/app/k8s/deployment.yaml')
-    if deployment_file.exists():
-        with open(deployment_file, 'r') as f:
-            docs = list(yaml.safe_load_all(f))
-        
-        for doc in docs:
-            if doc and doc.get('kind') == 'Deployment':
-                containers = doc.get('spec', {}).get('template', {}).get('spec', {}).get('containers', [])
-                
-                for container in containers:
-                    resources = container.get('resources', {})
-                    if not resources:
-                        issues.append(f"No resources defined for container {container.get('name')} in {doc['metadata']['name']}")
-                    else:
-                        if 'requests' not in resources:
-                            issues.append(f"No resource requests for container {container.get('name')}")
-                        if 'limits' not in resources:
-                            issues.append(f"No resource limits for container {container.get('name')}")
-    
+
+    for doc in docs:
+        if isinstance(doc, dict) and doc.get('kind') == 'Deployment':
+            containers = doc.get('spec', {}).get('template', {}).get('spec', {}).get('containers', [])
+
+            for container in containers:
+                resources = container.get('resources', {})
+                if not resources:
+                    issues.append(f"No resources defined for container {container.get('name')} in {doc['metadata']['name']}")
+                else:
+                    if 'requests' not in resources:
+                        issues.append(f"No resource requests for container {container.get('name')}")
+                    if 'limits' not in resources:
+                        issues.append(f"No resource limits for container {container.get('name')}")
+
     return issues
 
-def validate_health_checks():
+def validate_health_checks(docs):
     """Validate health check configurations"""
     issues = []
-    
-    deployment_file = Path('/app/k8s/deployment.yaml')
-    if deployment_file.exists():
-        with open(deployment_file, 'r') as f:
-            docs = list(yaml.safe_load_all(f))
-        
-        for doc in docs:
-            if doc and doc.get('kind') == 'Deployment':
-                containers = doc.get('spec', {}).get('template', {}).get('spec', {}).get('containers', [])
-                
-                for container in containers:
-                    name = container.get('name', 'unknown')
-                    
-                    if 'readinessProbe' not in container:
-                        issues.append(f"No readiness probe for container {name}")
-                    
-                    if 'livenessProbe' not in container:
-                        issues.append(f"No liveness probe for container {name}")
-    
+
+    for doc in docs:
+        if isinstance(doc, dict) and doc.get('kind') == 'Deployment':
+            containers = doc.get('spec', {}).get('template', {}).get('spec', {}).get('containers', [])
+
+            for container in containers:
+                name = container.get('name', 'unknown')
+
+                if 'readinessProbe' not in container:
+                    issues.append(f"No readiness probe for container {name}")
+
+                if 'livenessProbe' not in container:
+                    issues.append(f"No liveness probe for container {name}")
+
     return issues
 
 def main():
@@ -170,22 +165,29 @@ def main():
     print(f"📁 Found {len(yaml_files)} YAML files")
     print()
     
-    # Validate YAML syntax
+    # Parse and per-file validate each manifest exactly once, in parallel:
+    # PyYAML's pure-Python loader is CPU-bound, so worker processes scale
+    # with cores where threads would serialize on the GIL
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_validate_file, yaml_files))
+
+    parsed = {yaml_file: docs for yaml_file, docs, error, _ in results if error is None}
+
     print("🔍 Validating YAML Syntax:")
-    for yaml_file in yaml_files:
-        valid, result = validate_yaml_syntax(yaml_file)
-        if valid:
-            print(f"✅ {yaml_file.name}: Valid ({result} documents)")
+    for yaml_file, docs, error, _ in results:
+        if error is None:
+            print(f"✅ {yaml_file.name}: Valid ({len(docs)} documents)")
         else:
-            print(f"❌ {yaml_file.name}: Invalid - {result}")
+            print(f"❌ {yaml_file.name}: Invalid - {error}")
             total_issues += 1
-    
+
     print()
-    
+
     # Validate Kubernetes resources
     print("🔍 Validating Kubernetes Resources:")
-    for yaml_file in yaml_files:
-        issues = validate_kubernetes_resources(yaml_file)
+    for yaml_file, docs, error, issues in results:
+        if error is not None:
+            continue
         if not issues:
             print(f"✅ {yaml_file.name}: Valid Kubernetes resources")
         else:
@@ -198,7 +200,7 @@ def main():
     
     # Validate resource references
     print("🔍 Validating Resource References:")
-    ref_issues = validate_resource_references(k8s_dir)
+    ref_issues = validate_resource_references(parsed)
     if not ref_issues:
         print("✅ All resource references are valid")
     else:
@@ -211,7 +213,8 @@ def main():
     
     # Validate resource limits
     print("🔍 Validating Resource Limits:")
-    limit_issues = validate_resource_limits()
+    deployment_docs = parsed.get(k8s_dir / 'deployment.yaml', [])
+    limit_issues = validate_resource_limits(deployment_docs)
     if not limit_issues:
         print("✅ Resource limits properly configured")
     else:
@@ -224,7 +227,7 @@ def main():
     
     # Validate health checks
     print("🔍 Validating Health Checks:")
-    health_issues = validate_health_checks()
+    health_issues = validate_health_checks(deployment_docs)
     if not health_issues:
         print("✅ Health checks properly configured")
     else:
@@ -4,11 +4,24 @@ Container Environment Test
 Tests that the application would work correctly in Docker containers
 """
 
+import functools
 import os
 import sys
 import json
+import yaml
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+@functools.lru_cache(maxsize=None)
+def get_compose():
+    """Parse docker-compose.yml once; the networking/volume/health tests all share it"""
+    with open('/app/docker-compose.yml') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 def test_backend_with_docker_env():
     """Test backend with Docker environment variables"""
     print("🐍 Testing Backend with Docker Environment...")
@@ -87,66 +100,67 @@ def test_docker_networking():
     """Test Docker networking configuration"""
     print("\n🌐 Testing Docker Networking Configuration...")
     
-    # Check docker-compose.yml for proper networking
-    with open('/app/docker-compose.yml') as f:
-        content = f.read()
-        
+    # Structured lookups against the parsed compose file; substring scans
+    # could false-positive on comments
+    compose = get_compose()
+
     # Check that services are on the same network
-    if 'ideaboard_network' in content:
+    if 'ideaboard_network' in compose.get('networks', {}):
         print("✅ Custom network defined")
     else:
         print("❌ Custom network not defined")
         return False
-        
+
     # Check service dependencies
-    if 'depends_on:' in content:
+    if any('depends_on' in svc for svc in compose.get('services', {}).values()):
         print("✅ Service dependencies configured")
     else:
         print("❌ Service dependencies not configured")
         return False
-        
+
     return True
 
 def test_volume_persistence():
     """Test volume configuration for data persistence"""
     print("\n💾 Testing Volume Configuration...")
     
-    with open('/app/docker-compose.yml') as f:
-        content = f.read()
-        
-    if 'mongodb_data:' in content and 'volumes:' in content:
+    compose = get_compose()
+
+    if 'mongodb_data' in compose.get('volumes', {}):
         print("✅ MongoDB data volume configured")
     else:
         print("❌ MongoDB data volume not configured")
         return False
-        
-    if '/data/db' in content:
+
+    mongodb_volumes = compose.get('services', {}).get('mongodb', {}).get('volumes', [])
+    if any('/data/db' in str(volume) for volume in mongodb_volumes):
         print("✅ MongoDB data directory mounted")
     else:
         print("❌ MongoDB data directory not mounted")
         return False
-        
+
     return True
 
 def test_health_checks():
     """Test health check configuration"""
     print("\n🏥 Testing Health Check Configuration...")
     
-    with open('/app/docker-compose.yml') as f:
-        content = f.read()
-        
-    if 'healthcheck:' in content:
+    compose = get_compose()
+    services = compose.get('services', {})
+
+    if any('healthcheck' in svc for svc in services.values()):
         print("✅ Health checks configured")
     else:
         print("❌ Health checks not configured")
         return False
-        
-    if 'http://localhost:8000/api/' in content:
+
+    backend_check = services.get('backend', {}).get('healthcheck', {}).get('test', [])
+    if 'http://localhost:8000/api/' in str(backend_check):
         print("✅ Backend health check endpoint configured")
     else:
         print("❌ Backend health check endpoint not configured")
         return False
-        
+
     return True
 
 def test_production_readiness():